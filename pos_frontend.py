@@ -26,7 +26,7 @@ Running locally
 1. Ensure you have Python 3 installed.  Install Flask if it's not
    already available: ``pip install flask``.
 2. Place ``pos_frontend.py`` and ``pos_system.py`` in the same
-   directory.  The first web request will automatically create the
+   directory.  Starting the application will automatically create the
    database if it does not exist.
 3. Start the server by executing ``python pos_frontend.py``.  By
    default the application will listen on ``localhost:5000``.  Open
@@ -39,21 +39,18 @@ history—so you can run it comfortably in a local development
 environment.
 """
 
+import itertools
 import os
+import queue
 import sqlite3
-from typing import Optional
+import time
+from typing import List, Optional, Tuple
+from uuid import uuid4
 
-try:
-    import psycopg2  # type: ignore
-    import psycopg2.extras  # type: ignore
-    HAS_PSYCOPG2 = True
-except ImportError:
-    # psycopg2 may not be installed; use SQLite as fallback
-    HAS_PSYCOPG2 = False
-from datetime import datetime
-from typing import Optional, List
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+import pos_system
+from pos_system import format_timestamp, migrate_sqlite_timestamps, numbered_placeholders
 
 DB_FILENAME = "pos.db"
 
@@ -62,44 +59,111 @@ DB_FILENAME = "pos.db"
 # automatically if it does not exist.
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "uploads")
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+# Largest request body accepted; bigger uploads are rejected with 413
+MAX_UPLOAD_BYTES = 16 * 1024 * 1024
+
+# SQL expressions for the current time as Unix epoch seconds, the format
+# sales timestamps are stored in (shared with pos_system.py)
+_NOW_SQLITE = "CAST(strftime('%s', 'now') AS INTEGER)"
+_NOW_PG = "extract(epoch FROM now())::bigint"
+
+# Number of sales shown per page on the sales history page
+SALES_PAGE_SIZE = 50
+
+
+# Long-lived connections shared across requests.  PostgreSQL connections
+# come from a psycopg2 pool created on first use; SQLite connections are
+# kept in a simple LIFO queue so each request borrows an already-open
+# handle instead of reconnecting.
+_pg_pool = None
+_sqlite_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+
+# Set by create_tables() once the schema has been created or upgraded
+_SCHEMA_READY = False
+
+
+def _acquire_connection():
+    """Borrow a connection from the PostgreSQL pool or the SQLite queue."""
+    global _pg_pool
+    if BACKEND.is_pg:
+        if _pg_pool is None:
+            # Connect to PostgreSQL using credentials from environment variables
+            _pg_pool = pos_system.psycopg2.pool.ThreadedConnectionPool(
+                1,
+                10,
+                host=os.environ["DB_HOST"],
+                port=os.environ.get("DB_PORT", "5432"),
+                dbname=os.environ["DB_NAME"],
+                user=os.environ["DB_USER"],
+                password=os.environ["DB_PASSWORD"],
+                connection_factory=pos_system.PgConnection,
+            )
+        conn = _pg_pool.getconn()
+        # Use a DictCursor to return rows like dictionaries
+        conn.cursor_factory = pos_system.psycopg2.extras.DictCursor  # type: ignore
+        return conn
+    try:
+        return _sqlite_pool.get_nowait()
+    except queue.Empty:
+        # Fallback to SQLite.  Connections are handed between request
+        # threads, so the same-thread check is disabled; the pool ensures
+        # only one thread uses a connection at a time.  The statement cache
+        # keeps the compiled form of every query in STATEMENTS around.
+        conn = sqlite3.connect(
+            DB_FILENAME,
+            check_same_thread=False,
+            cached_statements=128,
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL with synchronous=NORMAL avoids an fsync per commit and lets
+        # readers run alongside a writer; the remaining settings keep temp
+        # tables, the page cache (~20 MB) and a 256 MB mmap window in memory.
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-20000;
+            """
+        )
+        return conn
+
+
+def _release_connection(conn) -> None:
+    """Return a connection obtained from _acquire_connection() to its pool."""
+    if BACKEND.is_pg:
+        # putconn() rolls back any transaction left open by the request
+        _pg_pool.putconn(conn)
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    _sqlite_pool.put(conn)
 
 
 def get_connection() -> sqlite3.Connection:
-    """Return a database connection to either PostgreSQL (RDS) or SQLite.
+    """Return the database connection for the current request.
 
     If environment variables for a PostgreSQL database are set (DB_HOST, DB_NAME,
-    DB_USER, DB_PASSWORD), this function connects using psycopg2.  Otherwise,
-    it falls back to the local SQLite database file.  After connecting,
-    create_tables() is called to ensure required tables and columns exist.
+    DB_USER, DB_PASSWORD), the connection comes from a psycopg2 connection
+    pool.  Otherwise, a pooled connection to the local SQLite database file is
+    used; the choice is made once at import time and stored in BACKEND.  The
+    connection is cached on ``flask.g`` and returned to its pool when the
+    application context is torn down.  Tables are created once by init_db()
+    rather than on every call.
     """
-    # Determine whether to use PostgreSQL based on environment variables
-    use_pg = (
-        HAS_PSYCOPG2
-        and os.environ.get("DB_HOST")
-        and os.environ.get("DB_NAME")
-        and os.environ.get("DB_USER")
-        and os.environ.get("DB_PASSWORD")
-    )
-    if use_pg:
-        # Connect to PostgreSQL using credentials from environment variables
-        conn = psycopg2.connect(
-            host=os.environ["DB_HOST"],
-            port=os.environ.get("DB_PORT", "5432"),
-            dbname=os.environ["DB_NAME"],
-            user=os.environ["DB_USER"],
-            password=os.environ["DB_PASSWORD"],
-        )
-        # Use a DictCursor to return rows like dictionaries
-        conn.cursor_factory = psycopg2.extras.DictCursor  # type: ignore
-        # Ensure tables exist
-        create_tables(conn)
-        return conn
-    else:
-        # Fallback to SQLite
-        conn = sqlite3.connect(DB_FILENAME)
-        conn.row_factory = sqlite3.Row
+    if "db" not in g:
+        g.db = _acquire_connection()
+    return g.db
+
+
+def init_db() -> None:
+    """Create required tables and columns once at startup."""
+    conn = _acquire_connection()
+    try:
         create_tables(conn)
-        return conn
+    finally:
+        _release_connection(conn)
 
 
 def create_tables(conn) -> None:
@@ -109,12 +173,14 @@ def create_tables(conn) -> None:
     `inventory` and `sales` tables.  It also adds additional columns using
     `ALTER TABLE ... ADD COLUMN IF NOT EXISTS` for PostgreSQL or checks
     existing columns for SQLite.  No error is raised if the columns already
-    exist.
+    exist.  The work is done only once per process; later calls return
+    immediately.
     """
-    # Determine if we are using PostgreSQL based on module availability and connection type
-    is_pg = HAS_PSYCOPG2 and isinstance(conn, psycopg2.extensions.connection)  # type: ignore
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
     cur = conn.cursor()
-    if is_pg:
+    if BACKEND.is_pg:
         # Create tables with Postgres syntax
         cur.execute(
             """
@@ -129,12 +195,12 @@ def create_tables(conn) -> None:
             """
         )
         cur.execute(
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS sales (
                 id SERIAL PRIMARY KEY,
                 item_id INTEGER NOT NULL REFERENCES inventory(id),
                 quantity INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
+                timestamp BIGINT NOT NULL DEFAULT {_NOW_PG},
                 total_price REAL NOT NULL,
                 cancelled INTEGER NOT NULL DEFAULT 0
             )
@@ -144,6 +210,26 @@ def create_tables(conn) -> None:
         cur.execute("ALTER TABLE inventory ADD COLUMN IF NOT EXISTS image_path TEXT")
         cur.execute("ALTER TABLE inventory ADD COLUMN IF NOT EXISTS favorite INTEGER DEFAULT 0")
         cur.execute("ALTER TABLE sales ADD COLUMN IF NOT EXISTS cancelled INTEGER DEFAULT 0")
+        # Older databases stored local ISO-8601 text; convert it to epoch seconds
+        cur.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'sales' AND column_name = 'timestamp'"
+        )
+        if cur.fetchone()[0] == "text":
+            cur.execute(
+                "ALTER TABLE sales ALTER COLUMN timestamp DROP DEFAULT, "
+                "ALTER COLUMN timestamp TYPE BIGINT "
+                "USING extract(epoch FROM timestamp::timestamptz)::bigint, "
+                f"ALTER COLUMN timestamp SET DEFAULT {_NOW_PG}"
+            )
+        # Indexes for the sales join/ordering and the inventory listing order
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_item_id ON sales(item_id)")
+        # Replaces the older timestamp-only index; id breaks ties for paging
+        cur.execute("DROP INDEX IF EXISTS idx_sales_ts")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_ts_id ON sales(timestamp DESC, id DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_inventory_favorite_name ON inventory(favorite DESC, name)")
+        cur.execute("ANALYZE inventory")
+        cur.execute("ANALYZE sales")
         conn.commit()
     else:
         # SQLite
@@ -160,12 +246,12 @@ def create_tables(conn) -> None:
             """
         )
         cur.execute(
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS sales (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 item_id INTEGER NOT NULL,
                 quantity INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
+                timestamp INTEGER NOT NULL DEFAULT ({_NOW_SQLITE}),
                 total_price REAL NOT NULL,
                 cancelled INTEGER NOT NULL DEFAULT 0,
                 FOREIGN KEY(item_id) REFERENCES inventory(id)
@@ -185,54 +271,240 @@ def create_tables(conn) -> None:
         sales_cols = [row[1] for row in cur.fetchall()]
         if "cancelled" not in sales_cols:
             cur.execute("ALTER TABLE sales ADD COLUMN cancelled INTEGER DEFAULT 0")
+        migrate_sqlite_timestamps(conn)
+        # Indexes for the sales join/ordering and the inventory listing order
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_item_id ON sales(item_id)")
+        # Replaces the older timestamp-only index; id breaks ties for paging
+        cur.execute("DROP INDEX IF EXISTS idx_sales_ts")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_ts_id ON sales(timestamp DESC, id DESC)")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_inventory_favorite_name "
+            "ON inventory(favorite DESC, name COLLATE NOCASE)"
+        )
+        cur.execute("ANALYZE")
         conn.commit()
+    _SCHEMA_READY = True
+
+
+# Frequently executed statements, keyed by name.  SQLite compiles each
+# statement once per connection and reuses it from the connection's
+# statement cache; PostgreSQL connections PREPARE them on first use.
+# ``{now}`` is replaced with the backend's current-time expression.  Names
+# differ from those in pos_system.STATEMENTS wherever the SQL does, since
+# both share the connection class and its stmt_cache.
+STATEMENTS = {
+    "insert_item_with_image": "INSERT INTO inventory (name, price, quantity, image_path) VALUES (?, ?, ?, ?)",
+    "select_item_details": "SELECT id, name, price, quantity, image_path FROM inventory WHERE id = ?",
+    "select_item_name": "SELECT name FROM inventory WHERE id = ?",
+    "select_item_quantity": "SELECT quantity FROM inventory WHERE id = ?",
+    "toggle_favorite": (
+        "UPDATE inventory SET favorite = CASE WHEN favorite <> 0 THEN 0 ELSE 1 END "
+        "WHERE id = ? RETURNING name, favorite"
+    ),
+    "decrement_stock": "UPDATE inventory SET quantity = quantity - ? WHERE id = ?",
+    "sell_stock_priced": (
+        "UPDATE inventory SET quantity = quantity - ? WHERE id = ? AND quantity >= ? "
+        "RETURNING name, price"
+    ),
+    "restore_stock": "UPDATE inventory SET quantity = quantity + ? WHERE id = ?",
+    "insert_sale_now": (
+        "INSERT INTO sales (item_id, quantity, timestamp, total_price) VALUES (?, ?, {now}, ?) "
+        "RETURNING timestamp"
+    ),
+    "select_sale": "SELECT cancelled, item_id, quantity FROM sales WHERE id = ?",
+    "cancel_sale": "UPDATE sales SET cancelled = 1 WHERE id = ? AND cancelled = 0 RETURNING item_id, quantity",
+    "uncancel_sale": (
+        "UPDATE sales SET cancelled = 0 WHERE id = ? AND cancelled <> 0 RETURNING item_id, quantity"
+    ),
+    "delete_sale": "DELETE FROM sales WHERE id = ?",
+    "list_sales": """
+        SELECT sales.id,
+               inventory.name AS item_name,
+               sales.quantity,
+               sales.total_price,
+               sales.timestamp,
+               sales.cancelled
+        FROM sales
+        JOIN inventory ON sales.item_id = inventory.id
+        ORDER BY sales.timestamp DESC, sales.id DESC
+        LIMIT ? OFFSET ?
+        """,
+}
+
+
+# STATEMENTS with placeholders already in each driver's style
+_SQL_SQLITE = {name: query.format(now=_NOW_SQLITE) for name, query in STATEMENTS.items()}
+_SQL_PG = {name: query.format(now=_NOW_PG).replace("?", "%s") for name, query in STATEMENTS.items()}
+
+# PREPARE bodies and matching EXECUTE calls for PostgreSQL
+_PG_PREPARE = {
+    name: f"PREPARE pos_{name} AS {numbered_placeholders(query.format(now=_NOW_PG))}"
+    for name, query in STATEMENTS.items()
+}
+_PG_EXECUTE = {
+    name: f"EXECUTE pos_{name}" + (f" ({', '.join(['%s'] * query.count('?'))})" if "?" in query else "")
+    for name, query in STATEMENTS.items()
+}
+
+
+# UPDATE statements for every combination of editable inventory columns,
+# keyed by the tuple of columns being set (in _UPDATE_FIELDS order)
+_UPDATE_FIELDS = ("name", "price", "quantity", "image_path")
+_UPDATE_SQLS = {
+    fields: f"UPDATE inventory SET {', '.join(field + ' = ?' for field in fields)} WHERE id = ?"
+    for n in range(1, len(_UPDATE_FIELDS) + 1)
+    for fields in itertools.combinations(_UPDATE_FIELDS, n)
+}
+_UPDATE_SQLS_PG = {fields: query.replace("?", "%s") for fields, query in _UPDATE_SQLS.items()}
+
+# Placeholder lists for IN (...) clauses with up to 64 values
+_IN_PLACEHOLDERS = {n: ",".join(["?"] * n) for n in range(1, 65)}
+_IN_PLACEHOLDERS_PG = {n: ",".join(["%s"] * n) for n in range(1, 65)}
+
+
+class SqliteBackend:
+    """SQL dialect and driver details for SQLite.
+
+    One backend is chosen at import time and bound to BACKEND.  Every
+    statement it holds is already written in the driver's placeholder
+    style, so no query text is rewritten at request time.
+    """
 
+    is_pg = False
+    placeholder = "?"
+    sql = _SQL_SQLITE
+    update_sqls = _UPDATE_SQLS
+    _in_placeholders = _IN_PLACEHOLDERS
+    # Case-insensitive search and ordering use LIKE and COLLATE NOCASE
+    list_inventory_sql = (
+        "SELECT id, name, price, quantity, image_path, favorite FROM inventory "
+        "ORDER BY favorite DESC, name COLLATE NOCASE"
+    )
+    search_inventory_sql = (
+        "SELECT id, name, price, quantity, image_path, favorite FROM inventory "
+        "WHERE name LIKE ? COLLATE NOCASE ORDER BY favorite DESC, name COLLATE NOCASE"
+    )
+    # Suffix that locks rows read before an update; SQLite has no row locks
+    # and takes the database write lock in begin_write() instead
+    for_update = ""
+
+    def in_placeholders(self, n: int) -> str:
+        """Return the placeholder list for an IN (...) clause with n values."""
+        placeholders = self._in_placeholders.get(n)
+        if placeholders is None:
+            placeholders = ",".join([self.placeholder] * n)
+        return placeholders
+
+    def begin_write(self, conn) -> None:
+        """Start a transaction that holds the write lock from its first read.
+
+        BEGIN IMMEDIATE stops other connections from writing between the
+        validation SELECT and the updates that depend on it.
+        """
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
 
-def list_inventory(conn, search_term: Optional[str] = None):
-    """Return a list of inventory items, optionally filtered by name.
+    def execute(self, cur, name: str, params: tuple = ()) -> None:
+        """Execute the named statement from STATEMENTS on the given cursor.
 
-    Items are sorted alphabetically with favorites first.  When using
-    PostgreSQL, case‑insensitive search and ordering are achieved using
-    ILIKE and the default collation; when using SQLite, LIKE with
-    `COLLATE NOCASE` is used.
-    """
-    cur = conn.cursor()
-    is_pg = HAS_PSYCOPG2 and isinstance(conn, psycopg2.extensions.connection)  # type: ignore
-    query = "SELECT id, name, price, quantity, image_path, favorite FROM inventory"
-    params: list = []
-    if search_term:
-        if is_pg:
-            query += " WHERE name ILIKE %s"
+        The SQL text is passed through unchanged so the connection's
+        statement cache can reuse the compiled statement.
+        """
+        cur.execute(self.sql[name], params)
+
+    def executemany(self, cur, name: str, rows: List[tuple]) -> None:
+        """Execute the named statement once for every parameter tuple in rows."""
+        cur.executemany(self.sql[name], rows)
+
+    def bulk_insert(self, conn, table: str, cols: Tuple[str, ...], rows: List[tuple]) -> None:
+        """Insert many rows into ``table`` with executemany().
+
+        ``table`` and ``cols`` are interpolated into the SQL and must never
+        come from user input.
+        """
+        values = ", ".join([self.placeholder] * len(cols))
+        conn.cursor().executemany(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({values})", rows)
+
+    def list_inventory(self, conn, search_term: Optional[str] = None):
+        """Return a list of inventory items, optionally filtered by name.
+
+        Items are sorted alphabetically with favorites first.
+        """
+        cur = conn.cursor()
+        if search_term:
+            cur.execute(self.search_inventory_sql, (f"%{search_term}%",))
         else:
-            query += " WHERE name LIKE ? COLLATE NOCASE"
-        params.append(f"%{search_term}%")
-    # Ordering
-    if is_pg:
-        query += " ORDER BY favorite DESC, name"
-    else:
-        query += " ORDER BY favorite DESC, name COLLATE NOCASE"
-    # Replace placeholders for Postgres
-    if is_pg:
-        query_exec = query
-    else:
-        query_exec = query
-    cur.execute(query_exec.replace("?", "%s") if is_pg else query_exec, params)
-    return cur.fetchall()
+            cur.execute(self.list_inventory_sql)
+        return cur.fetchall()
+
+
+class PgBackend(SqliteBackend):
+    """SQL dialect and driver details for PostgreSQL via psycopg2."""
+
+    is_pg = True
+    placeholder = "%s"
+    sql = _SQL_PG
+    update_sqls = _UPDATE_SQLS_PG
+    _in_placeholders = _IN_PLACEHOLDERS_PG
+    # Case-insensitive search uses ILIKE and ordering the default collation
+    list_inventory_sql = (
+        "SELECT id, name, price, quantity, image_path, favorite FROM inventory "
+        "ORDER BY favorite DESC, name"
+    )
+    search_inventory_sql = (
+        "SELECT id, name, price, quantity, image_path, favorite FROM inventory "
+        "WHERE name ILIKE %s ORDER BY favorite DESC, name"
+    )
+    for_update = " FOR UPDATE"
+
+    def begin_write(self, conn) -> None:
+        """psycopg2 opens the transaction itself; rows are locked by for_update."""
+
+    def execute(self, cur, name: str, params: tuple = ()) -> None:
+        """Execute the named statement from STATEMENTS on the given cursor.
+
+        The statement is prepared on the server the first time a connection
+        uses it; the connection's stmt_cache then holds the EXECUTE call.
+        """
+        stmt_cache = cur.connection.stmt_cache
+        sql = stmt_cache.get(name)
+        if sql is None:
+            cur.execute(_PG_PREPARE[name])
+            sql = stmt_cache[name] = _PG_EXECUTE[name]
+        cur.execute(sql, params)
+
+    def executemany(self, cur, name: str, rows: List[tuple]) -> None:
+        """Execute the named statement for every row using execute_batch()."""
+        pos_system.psycopg2.extras.execute_batch(cur, self.sql[name], rows)
+
+    def bulk_insert(self, conn, table: str, cols: Tuple[str, ...], rows: List[tuple]) -> None:
+        """Insert many rows into ``table`` with execute_values().
+
+        Rows are sent in pages of up to 1000 as a single multi-row INSERT.
+        ``table`` and ``cols`` are interpolated into the SQL and must never
+        come from user input.
+        """
+        pos_system.psycopg2.extras.execute_values(
+            conn.cursor(),
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES %s",
+            rows,
+            page_size=1000,
+        )
+
+
+# The backend for this process, picked from the environment at startup
+BACKEND = PgBackend() if pos_system.use_postgres() else SqliteBackend()
 
 
 def add_item_db(conn: sqlite3.Connection, name: str, price: float, quantity: int) -> None:
     c = conn.cursor()
-    c.execute(
-        "INSERT INTO inventory (name, price, quantity) VALUES (?, ?, ?)",
-        (name.strip(), price, quantity),
-    )
+    BACKEND.execute(c, "insert_item_with_image", (name.strip(), price, quantity, None))
     conn.commit()
 
 def add_item_with_image(conn: sqlite3.Connection, name: str, price: float, quantity: int, image_path: Optional[str]) -> None:
     """Add an item with an optional image path."""
     c = conn.cursor()
-    query = "INSERT INTO inventory (name, price, quantity, image_path) VALUES (?, ?, ?, ?)"
-    c.execute(adapt_sql(query, conn), (name.strip(), price, quantity, image_path))
+    BACKEND.execute(c, "insert_item_with_image", (name.strip(), price, quantity, image_path))
     conn.commit()
 
 
@@ -248,102 +520,162 @@ def update_item_db(
 
     Only fields that are not None will be updated.  If image_path is
     provided, the previous image file (if any) should be cleaned up by
-    the caller before calling this function.
+    the caller after this function returns.
     """
     c = conn.cursor()
-    # Build dynamic set clause
+    # Pick the precomputed statement for the supplied fields
     fields = []
     values: List[object] = []
     if name is not None:
-        fields.append("name = ?")
+        fields.append("name")
         values.append(name.strip())
     if price is not None:
-        fields.append("price = ?")
+        fields.append("price")
         values.append(price)
     if quantity is not None:
-        fields.append("quantity = ?")
+        fields.append("quantity")
         values.append(quantity)
     if image_path is not None:
-        fields.append("image_path = ?")
+        fields.append("image_path")
         values.append(image_path)
     if not fields:
         return
     values.append(item_id)
-    set_clause = ", ".join(fields)
-    query = f"UPDATE inventory SET {set_clause} WHERE id = ?"
-    c.execute(adapt_sql(query, conn), values)
+    c.execute(BACKEND.update_sqls[tuple(fields)], values)
     conn.commit()
 
 
 def record_sale_db(conn: sqlite3.Connection, item_id: int, quantity: int) -> str:
     """Attempt to record a sale; return a status message."""
+    if quantity <= 0:
+        return "Quantity must be positive."
     c = conn.cursor()
-    # Select item details
-    c.execute(adapt_sql("SELECT name, price, quantity FROM inventory WHERE id = ?", conn), (item_id,))
+    # Deduct quantity only if enough stock is on hand, in a single statement
+    BACKEND.execute(c, "sell_stock_priced", (quantity, item_id, quantity))
     row = c.fetchone()
     if row is None:
-        return f"Item with ID {item_id} does not exist."
-    if quantity <= 0:
-        return "Quantity must be positive."
-    if row["quantity"] < quantity:
-        return f"Insufficient stock. Available: {row['quantity']}"
-    # Compute total and update inventory
+        # Nothing was updated; find out whether the item is missing or short
+        BACKEND.execute(c, "select_item_quantity", (item_id,))
+        stock_row = c.fetchone()
+        if stock_row is None:
+            return f"Item with ID {item_id} does not exist."
+        return f"Insufficient stock. Available: {stock_row['quantity']}"
     total = row["price"] * quantity
-    # Deduct quantity from inventory
-    c.execute(
-        adapt_sql("UPDATE inventory SET quantity = quantity - ? WHERE id = ?", conn),
-        (quantity, item_id),
-    )
-    timestamp = datetime.now().isoformat(timespec="seconds")
-    c.execute(
-        adapt_sql(
-            "INSERT INTO sales (item_id, quantity, timestamp, total_price) VALUES (?, ?, ?, ?)",
-            conn,
-        ),
-        (item_id, quantity, timestamp, total),
-    )
+    # The database stamps the sale and hands the timestamp back
+    BACKEND.execute(c, "insert_sale_now", (item_id, quantity, total))
+    timestamp = format_timestamp(c.fetchone()["timestamp"])
     conn.commit()
     return f"Sold {quantity} × '{row['name']}' for ${total:.2f} at {timestamp}."
 
 
-def list_sales(conn: sqlite3.Connection) -> List[sqlite3.Row]:
-    """Return sales records, including cancelled status."""
+def record_sales_db(conn: sqlite3.Connection, lines: List[Tuple[int, int]]) -> List[str]:
+    """Record several sales in a single transaction; return one message per line.
+
+    ``lines`` is a list of ``(item_id, quantity)`` pairs.  All items are
+    fetched with one query and validated in Python, then the inventory
+    decrements and sale rows are written with batched statements and a
+    single commit.  The items stay locked from the SELECT to the commit so
+    a concurrent sale cannot oversell them.  Lines that fail validation are skipped, matching
+    record_sale_db().
+    """
+    BACKEND.begin_write(conn)
     c = conn.cursor()
+    item_ids = [item_id for item_id, _ in lines]
+    placeholders = BACKEND.in_placeholders(len(item_ids))
     c.execute(
-        """
-        SELECT sales.id,
-               inventory.name AS item_name,
-               sales.quantity,
-               sales.total_price,
-               sales.timestamp,
-               sales.cancelled
-        FROM sales
-        JOIN inventory ON sales.item_id = inventory.id
-        ORDER BY sales.timestamp DESC
-        """
+        f"SELECT id, name, price, quantity FROM inventory WHERE id IN ({placeholders})"
+        f"{BACKEND.for_update}",
+        item_ids,
     )
+    rows = {row["id"]: row for row in c.fetchall()}
+    timestamp = int(time.time())
+    timestamp_fmt = format_timestamp(timestamp)
+    decrements: List[Tuple[int, int]] = []
+    sale_rows: List[Tuple[int, int, int, float]] = []
+    messages: List[str] = []
+    for item_id, quantity in lines:
+        row = rows.get(item_id)
+        if row is None:
+            messages.append(f"Item with ID {item_id} does not exist.")
+            continue
+        if quantity <= 0:
+            messages.append("Quantity must be positive.")
+            continue
+        if row["quantity"] < quantity:
+            messages.append(f"Insufficient stock. Available: {row['quantity']}")
+            continue
+        total = row["price"] * quantity
+        decrements.append((quantity, item_id))
+        sale_rows.append((item_id, quantity, timestamp, total))
+        messages.append(f"Sold {quantity} × '{row['name']}' for ${total:.2f} at {timestamp_fmt}.")
+    if sale_rows:
+        BACKEND.executemany(c, "decrement_stock", decrements)
+        BACKEND.bulk_insert(conn, "sales", ("item_id", "quantity", "timestamp", "total_price"), sale_rows)
+    conn.commit()
+    return messages
+
+
+def list_sales(conn: sqlite3.Connection, limit: int = 50, offset: int = 0) -> List[sqlite3.Row]:
+    """Return one page of sales records, newest first, including cancelled status."""
+    c = conn.cursor()
+    BACKEND.execute(c, "list_sales", (limit, offset))
     return c.fetchall()
 
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "replace-with-a-secure-secret-key"
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+
+
+@app.teardown_appcontext
+def close_connection(exc: Optional[BaseException] = None) -> None:
+    """Hand the request's database connection back to its pool."""
+    conn = g.pop("db", None)
+    if conn is not None:
+        _release_connection(conn)
 
 
-# Helper to adapt SQL parameter placeholders for PostgreSQL
-def adapt_sql(query: str, conn, params_present: bool = True) -> str:
-    """Return a SQL statement with correct parameter placeholders.
+def save_upload(image_file, ext: str) -> Optional[str]:
+    """Save an uploaded image and return its path relative to ``static``.
 
-    SQLite uses '?' as the placeholder, whereas psycopg2 (PostgreSQL) uses '%s'.
-    This function replaces every '?' with '%s' when the connection is a
-    psycopg2 connection.  If no parameters are supplied (params_present=False),
-    the query is returned unchanged.
+    The upload is streamed from werkzeug's spooled file to a temporary
+    name and moved into place, so a half-written file is never visible
+    under its final name.  Returns None if the file could not be saved.
     """
-    is_pg = HAS_PSYCOPG2 and isinstance(conn, psycopg2.extensions.connection)  # type: ignore
-    if params_present and is_pg:
-        # Replace all '?' with '%s'
-        return query.replace("?", "%s")
-    return query
+    # Ensure upload directory exists
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+    # Create a unique filename to avoid collisions
+    unique_name = f"{uuid4().hex}.{ext}"
+    save_path = os.path.join(app.config["UPLOAD_FOLDER"], unique_name)
+    tmp_path = save_path + ".part"
+    try:
+        image_file.save(tmp_path)
+        os.replace(tmp_path, save_path)
+    except OSError:
+        app.logger.exception("Failed to save uploaded image %s", save_path)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    # Store relative path for use in HTML
+    return os.path.join("uploads", unique_name)
+
+
+def _remove_image(image_path: Optional[str]) -> None:
+    """Delete a stored image given its path relative to ``static``, if present."""
+    if not image_path:
+        return
+    full_path = os.path.join(app.config["UPLOAD_FOLDER"], os.path.basename(image_path))
+    try:
+        os.remove(full_path)
+    except OSError:
+        pass
+
+
+# Ensure tables exist before the first request is served
+init_db()
 
 
 @app.route("/")
@@ -351,39 +683,47 @@ def index():
     # Search query
     search_term = request.args.get("q", "").strip()
     with get_connection() as conn:
-        items = list_inventory(conn, search_term)
-        # Separate favorites and others
-        favorites = [item for item in items if item["favorite"]]
-        nonfavorites = [item for item in items if not item["favorite"]]
+        # Format prices once here rather than per row in the template
+        items = [
+            dict(row, price_fmt=f"${row['price']:.2f}")
+            for row in BACKEND.list_inventory(conn, search_term)
+        ]
+        # Separate favorites and others.  list_inventory() returns favorites
+        # first, so the split point is where the first non-favorite appears.
+        favorites = list(itertools.takewhile(lambda item: item["favorite"], items))
+        nonfavorites = items[len(favorites):]
         # Build cart details from session
         cart = session.get("cart", {})
         cart_items: List[dict] = []
         cart_total = 0.0
         if cart:
-            item_ids = [int(item_id) for item_id in cart.keys()]
-            if item_ids:
-                placeholders = ",".join(["?"] * len(item_ids))
+            cart_lines = [(int(item_id), qty) for item_id, qty in cart.items()]
+            # Cart items are normally part of the listing already; only
+            # look up the ones hidden by the current search filter.
+            items_map = {row["id"]: row for row in items}
+            missing_ids = [iid for iid, _ in cart_lines if iid not in items_map]
+            if missing_ids:
+                placeholders = BACKEND.in_placeholders(len(missing_ids))
                 c = conn.cursor()
                 c.execute(
                     f"SELECT id, name, price FROM inventory WHERE id IN ({placeholders})",
-                    item_ids,
+                    missing_ids,
                 )
-                items_map = {row["id"]: row for row in c.fetchall()}
-                for item_id_str, qty in cart.items():
-                    iid = int(item_id_str)
-                    item_row = items_map.get(iid)
-                    if item_row:
-                        total = item_row["price"] * qty
-                        cart_total += total
-                        cart_items.append(
-                            {
-                                "id": iid,
-                                "name": item_row["name"],
-                                "price": item_row["price"],
-                                "quantity": qty,
-                                "total": total,
-                            }
-                        )
+                items_map.update((row["id"], row) for row in c.fetchall())
+            for iid, qty in cart_lines:
+                item_row = items_map.get(iid)
+                if item_row:
+                    total = item_row["price"] * qty
+                    cart_total += total
+                    cart_items.append(
+                        {
+                            "id": iid,
+                            "name": item_row["name"],
+                            "price": item_row["price"],
+                            "quantity": qty,
+                            "total": total,
+                        }
+                    )
         return render_template(
             "index.html",
             favorites=favorites,
@@ -434,16 +774,10 @@ def add_item():
             if ext not in ALLOWED_EXTENSIONS:
                 flash("Unsupported image type. Allowed types: " + ", ".join(ALLOWED_EXTENSIONS), "danger")
                 return redirect(url_for("add_item"))
-            # Ensure upload directory exists
-            os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-            # Create a unique filename to avoid collisions
-            from uuid import uuid4
-
-            unique_name = f"{uuid4().hex}.{ext}"
-            save_path = os.path.join(app.config["UPLOAD_FOLDER"], unique_name)
-            image_file.save(save_path)
-            # Store relative path for use in HTML
-            image_path = os.path.join("uploads", unique_name)
+            image_path = save_upload(image_file, ext)
+            if image_path is None:
+                flash("The image could not be saved.", "danger")
+                return redirect(url_for("add_item"))
 
         with get_connection() as conn:
             # Use the extended function to support images
@@ -455,9 +789,20 @@ def add_item():
 
 @app.route("/sales")
 def sales():
+    page = max(request.args.get("page", 1, type=int), 1)
     with get_connection() as conn:
-        sales_rows = list_sales(conn)
-    return render_template("sales.html", sales=sales_rows)
+        # Fetch one extra row to find out whether a next page exists
+        sales_rows = list_sales(conn, limit=SALES_PAGE_SIZE + 1, offset=(page - 1) * SALES_PAGE_SIZE)
+    has_next = len(sales_rows) > SALES_PAGE_SIZE
+    return render_template(
+        "sales.html",
+        sales=[
+            dict(row, timestamp_fmt=format_timestamp(row["timestamp"]))
+            for row in sales_rows[:SALES_PAGE_SIZE]
+        ],
+        page=page,
+        has_next=has_next,
+    )
 
 
 @app.route("/edit-item/<int:item_id>", methods=["GET", "POST"])
@@ -465,10 +810,7 @@ def edit_item(item_id: int):
     """View and update an existing item."""
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute(
-            "SELECT id, name, price, quantity, image_path FROM inventory WHERE id = ?",
-            (item_id,),
-        )
+        BACKEND.execute(c, "select_item_details", (item_id,))
         item = c.fetchone()
         if item is None:
             flash("Item not found.", "danger")
@@ -500,24 +842,10 @@ def edit_item(item_id: int):
                         "danger",
                     )
                     return redirect(url_for("edit_item", item_id=item_id))
-                # Delete old image if exists
-                old_path = item["image_path"]
-                if old_path:
-                    old_full_path = os.path.join(
-                        os.path.dirname(os.path.abspath(__file__)), "static", old_path
-                    )
-                    if os.path.isfile(old_full_path):
-                        try:
-                            os.remove(old_full_path)
-                        except OSError:
-                            pass
-                os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-                from uuid import uuid4
-
-                unique_name = f"{uuid4().hex}.{ext}"
-                save_path = os.path.join(app.config["UPLOAD_FOLDER"], unique_name)
-                image_file.save(save_path)
-                new_image_path = os.path.join("uploads", unique_name)
+                new_image_path = save_upload(image_file, ext)
+                if new_image_path is None:
+                    flash("The new image could not be saved.", "danger")
+                    return redirect(url_for("edit_item", item_id=item_id))
             # Perform the update
             update_item_db(
                 conn,
@@ -525,8 +853,11 @@ def edit_item(item_id: int):
                 name=new_name,
                 price=new_price,
                 quantity=new_qty,
-                image_path=new_image_path if image_file and image_file.filename else None,
+                image_path=new_image_path,
             )
+            # The old image is only deleted once the new one is saved and stored
+            if new_image_path is not None:
+                _remove_image(item["image_path"])
             flash("Item updated successfully.", "success")
             return redirect(url_for("index"))
         # GET request – render form with current values
@@ -541,7 +872,7 @@ def allowed_file(filename: str) -> bool:
 @app.route("/add-to-cart", methods=["POST"])
 def add_to_cart():
     """Add an item to the shopping cart stored in the session."""
-    item_id = request.form.get("item_id")
+    item_id = request.form.get("item_id", type=int)
     # Default quantity to 1 if not provided
     qty_str = request.form.get("quantity", "1")
     try:
@@ -549,21 +880,27 @@ def add_to_cart():
     except ValueError:
         flash("Invalid quantity.", "danger")
         return redirect(url_for("index"))
-    if not item_id:
+    if item_id is None:
         flash("No item specified.", "danger")
         return redirect(url_for("index"))
     # Retrieve item name for feedback
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute(adapt_sql("SELECT name FROM inventory WHERE id = ?", conn), (int(item_id),))
+        BACKEND.execute(c, "select_item_name", (item_id,))
         row = c.fetchone()
         if row is None:
             flash("Item does not exist.", "danger")
             return redirect(url_for("index"))
         item_name = row["name"]
-    cart = session.get("cart", {})
-    cart[item_id] = cart.get(item_id, 0) + quantity
-    session["cart"] = cart
+    # Mutate the cart in place and only mark the session dirty on a change.
+    # The session is stored as JSON, so keys are canonical item ID strings.
+    key = str(item_id)
+    cart = session.get("cart")
+    if cart is None:
+        cart = session["cart"] = {}
+    if quantity or key not in cart:
+        cart[key] = cart.get(key, 0) + quantity
+        session.modified = True
     flash(f"Added {quantity} × '{item_name}' to cart.", "success")
     return redirect(url_for("index"))
 
@@ -571,18 +908,19 @@ def add_to_cart():
 @app.route("/update-cart", methods=["POST"])
 def update_cart():
     """Update the quantity of a specific item in the cart or remove it."""
-    item_id = request.form.get("item_id")
-    if not item_id:
+    item_id = request.form.get("item_id", type=int)
+    if item_id is None:
         flash("Invalid cart update request.", "danger")
         return redirect(url_for("index"))
+    item_id = str(item_id)
     cart = session.get("cart", {})
     if item_id not in cart:
         flash("Item not in cart.", "danger")
         return redirect(url_for("index"))
     # Check if remove was requested
     if request.form.get("action") == "remove":
-        cart.pop(item_id, None)
-        session["cart"] = cart
+        del cart[item_id]
+        session.modified = True
         flash("Item removed from cart.", "info")
         return redirect(url_for("index"))
     # Otherwise update quantity
@@ -590,14 +928,16 @@ def update_cart():
     try:
         new_qty = int(qty_str)
         if new_qty <= 0:
-            cart.pop(item_id, None)
+            del cart[item_id]
+            session.modified = True
             flash("Item removed from cart.", "info")
         else:
-            cart[item_id] = new_qty
+            if cart[item_id] != new_qty:
+                cart[item_id] = new_qty
+                session.modified = True
             flash("Cart updated.", "success")
     except (TypeError, ValueError):
         flash("Invalid quantity.", "danger")
-    session["cart"] = cart
     return redirect(url_for("index"))
 
 
@@ -608,13 +948,10 @@ def checkout():
     if not cart:
         flash("Cart is empty; nothing to checkout.", "warning")
         return redirect(url_for("index"))
-    messages = []
+    lines = [(int(item_id_str), qty) for item_id_str, qty in cart.items()]
     with get_connection() as conn:
-        for item_id_str, qty in list(cart.items()):
-            item_id = int(item_id_str)
-            msg = record_sale_db(conn, item_id, qty)
-            messages.append(msg)
-    session["cart"] = {}
+        messages = record_sales_db(conn, lines)
+    session.pop("cart", None)
     flash("Checkout complete. " + " ".join(messages), "success")
     return redirect(url_for("index"))
 
@@ -623,11 +960,12 @@ def checkout():
 def clear_cart():
     """Empty the current shopping cart.
 
-    This route resets the session cart to an empty dictionary and
-    redirects back to the home page with a confirmation message.
+    This route removes the cart from the session and redirects back to
+    the home page with a confirmation message.
     """
-    # Remove cart from session or reset to empty
-    session["cart"] = {}
+    # Only touch the session when there is a cart to remove
+    if "cart" in session:
+        del session["cart"]
     flash("Cart cleared.", "info")
     return redirect(url_for("index"))
 
@@ -637,15 +975,14 @@ def toggle_favorite(item_id: int):
     """Toggle the favorite status of an inventory item."""
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute(adapt_sql("SELECT name, favorite FROM inventory WHERE id = ?", conn), (item_id,))
+        # Flip the flag and read back the name for the message in one statement
+        BACKEND.execute(c, "toggle_favorite", (item_id,))
         row = c.fetchone()
         if row is None:
             flash("Item not found.", "danger")
             return redirect(url_for("index"))
-        new_fav = 0 if row["favorite"] else 1
-        c.execute(adapt_sql("UPDATE inventory SET favorite = ? WHERE id = ?", conn), (new_fav, item_id))
         conn.commit()
-        action = "added to" if new_fav else "removed from"
+        action = "added to" if row["favorite"] else "removed from"
         flash(f"'{row['name']}' {action} favorites.", "info")
     return redirect(url_for("index"))
 
@@ -653,24 +990,43 @@ def toggle_favorite(item_id: int):
 # Cancel a sale record and restore inventory
 def cancel_sale_db(conn: sqlite3.Connection, sale_id: int) -> str:
     c = conn.cursor()
-    c.execute(
-        adapt_sql("SELECT cancelled, item_id, quantity FROM sales WHERE id = ?", conn),
-        (sale_id,),
-    )
+    # Mark as cancelled if it is not already, returning what to restore
+    BACKEND.execute(c, "cancel_sale", (sale_id,))
     row = c.fetchone()
     if row is None:
-        return "Sale not found."
-    if row["cancelled"]:
+        BACKEND.execute(c, "select_sale", (sale_id,))
+        if c.fetchone() is None:
+            return "Sale not found."
         return "Sale has already been cancelled."
-    # Mark as cancelled
-    c.execute(adapt_sql("UPDATE sales SET cancelled = 1 WHERE id = ?", conn), (sale_id,))
     # Restore inventory quantity
+    BACKEND.execute(c, "restore_stock", (row["quantity"], row["item_id"]))
+    conn.commit()
+    return "Sale cancelled and inventory restored."
+
+
+def cancel_sales_bulk(conn: sqlite3.Connection, sale_ids: List[int]) -> str:
+    """Cancel several sales in one transaction and restore their inventory.
+
+    Sales that are missing or already cancelled are skipped.  The flags
+    are flipped first, so only the sales this call actually cancelled
+    have their stock restored, with a single batched UPDATE; the whole
+    batch is committed once.
+    """
+    if not sale_ids:
+        return "No sales selected."
+    c = conn.cursor()
     c.execute(
-        adapt_sql("UPDATE inventory SET quantity = quantity + ? WHERE id = ?", conn),
-        (row["quantity"], row["item_id"]),
+        f"UPDATE sales SET cancelled = 1 WHERE id IN ({BACKEND.in_placeholders(len(sale_ids))}) "
+        "AND cancelled = 0 RETURNING item_id, quantity",
+        sale_ids,
     )
+    rows = c.fetchall()
+    if not rows:
+        return "No sales to cancel."
+    restores = [(row["quantity"], row["item_id"]) for row in rows]
+    BACKEND.executemany(c, "restore_stock", restores)
     conn.commit()
-    return "Sale cancelled and inventory restored."
+    return f"{len(rows)} sale(s) cancelled and inventory restored."
 
 
 @app.route("/cancel-sale/<int:sale_id>", methods=["POST"])
@@ -686,21 +1042,15 @@ def cancel_sale(sale_id: int):
 # Delete a sale record and optionally adjust inventory
 def delete_sale_db(conn: sqlite3.Connection, sale_id: int) -> str:
     c = conn.cursor()
-    c.execute(
-        adapt_sql("SELECT cancelled, item_id, quantity FROM sales WHERE id = ?", conn),
-        (sale_id,),
-    )
+    BACKEND.execute(c, "select_sale", (sale_id,))
     row = c.fetchone()
     if row is None:
         return "Sale not found."
     # If the sale was not cancelled, restore inventory before deleting
     if not row["cancelled"]:
-        c.execute(
-            adapt_sql("UPDATE inventory SET quantity = quantity + ? WHERE id = ?", conn),
-            (row["quantity"], row["item_id"]),
-        )
+        BACKEND.execute(c, "restore_stock", (row["quantity"], row["item_id"]))
     # Delete the sale
-    c.execute(adapt_sql("DELETE FROM sales WHERE id = ?", conn), (sale_id,))
+    BACKEND.execute(c, "delete_sale", (sale_id,))
     conn.commit()
     return "Sale deleted permanently and inventory adjusted." if not row["cancelled"] else "Sale deleted permanently."
 
@@ -708,29 +1058,23 @@ def delete_sale_db(conn: sqlite3.Connection, sale_id: int) -> str:
 # Uncancel a sale record and deduct inventory
 def uncancel_sale_db(conn: sqlite3.Connection, sale_id: int) -> str:
     c = conn.cursor()
-    c.execute(
-        adapt_sql("SELECT cancelled, item_id, quantity FROM sales WHERE id = ?", conn),
-        (sale_id,),
-    )
+    # Mark as not cancelled if it is cancelled, returning what to deduct
+    BACKEND.execute(c, "uncancel_sale", (sale_id,))
     row = c.fetchone()
     if row is None:
-        return "Sale not found."
-    if not row["cancelled"]:
+        BACKEND.execute(c, "select_sale", (sale_id,))
+        if c.fetchone() is None:
+            return "Sale not found."
         return "Sale is not cancelled."
-    # Check if there is enough inventory to reapply the sale
-    c.execute(adapt_sql("SELECT quantity FROM inventory WHERE id = ?", conn), (row["item_id"],))
-    item_row = c.fetchone()
-    if item_row is None:
-        return "Associated item not found."
-    if item_row["quantity"] < row["quantity"]:
+    # Deduct inventory only if enough stock is on hand to reapply the sale
+    BACKEND.execute(c, "sell_stock_priced", (row["quantity"], row["item_id"], row["quantity"]))
+    if c.fetchone() is None:
+        # Keep the sale cancelled
+        conn.rollback()
+        BACKEND.execute(c, "select_item_quantity", (row["item_id"],))
+        if c.fetchone() is None:
+            return "Associated item not found."
         return "Not enough stock to uncancel this sale."
-    # Deduct inventory
-    c.execute(
-        adapt_sql("UPDATE inventory SET quantity = quantity - ? WHERE id = ?", conn),
-        (row["quantity"], row["item_id"]),
-    )
-    # Mark sale as not cancelled
-    c.execute(adapt_sql("UPDATE sales SET cancelled = 0 WHERE id = ?", conn), (sale_id,))
     conn.commit()
     return "Sale un‑cancelled and inventory updated."
 
@@ -37,35 +37,141 @@ implements a lightweight version of those capabilities suitable for a
 local environment.
 """
 
-import sqlite3
-import os
-
-# Attempt to import psycopg2 for PostgreSQL support.  If not available or
-# environment variables are not set, the system will fall back to SQLite.
-try:
-    import psycopg2  # type: ignore
-    import psycopg2.extras  # type: ignore
-    HAS_PSYCOPG2 = True
-except ImportError:
-    HAS_PSYCOPG2 = False
+import functools
 import os
+import sqlite3
+import sys
+import time
 from datetime import datetime
-from typing import Optional, List, Tuple
+from itertools import chain, islice
+from typing import Dict, Iterator, Optional, List, Tuple
 
 
 DB_FILENAME = "pos.db"
 
+# psycopg2 is only imported once PostgreSQL settings are found in the
+# environment, so the default SQLite setup never loads it (or libpq).
+psycopg2 = None
+HAS_PSYCOPG2: Optional[bool] = None  # None until the import has been attempted
+PgConnection = None
+
+# PostgreSQL connection pool, created on the first get_connection() call
+_PG_POOL = None
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999, i.e. 333 three-column rows.
+_BULK_CHUNK_ROWS = 999 // 3
+
+
+# Statements run by the item and sale helpers, written with SQLite's '?'
+# placeholders.  Each connection caches them ready to run in stmt_cache.
+STATEMENTS = {
+    "insert_item": "INSERT INTO inventory (name, price, quantity) VALUES (?, ?, ?)",
+    "select_item": "SELECT name, price, quantity FROM inventory WHERE id = ?",
+    # NULL parameters keep the column's current value
+    "update_item": (
+        "UPDATE inventory SET name = COALESCE(?, name), price = COALESCE(?, price), "
+        "quantity = COALESCE(?, quantity) WHERE id = ? RETURNING id"
+    ),
+    "delete_item": "DELETE FROM inventory WHERE id = ? RETURNING name",
+    "sell_stock": (
+        "UPDATE inventory SET quantity = quantity - ? WHERE id = ? AND quantity >= ? "
+        "RETURNING name"
+    ),
+    # total_price is computed from the stored price rather than passed in
+    "insert_sale": (
+        "INSERT INTO sales (item_id, quantity, timestamp, total_price) "
+        "SELECT id, ?, ?, price * ? FROM inventory WHERE id = ? "
+        "RETURNING total_price"
+    ),
+    # Variants without RETURNING for executemany(), used by record_sales_bulk
+    "sell_stock_batch": "UPDATE inventory SET quantity = quantity - ? WHERE id = ? AND quantity >= ?",
+    "insert_sale_batch": (
+        "INSERT INTO sales (item_id, quantity, timestamp, total_price) "
+        "SELECT id, ?, ?, price * ? FROM inventory WHERE id = ?"
+    ),
+}
+
+
+def numbered_placeholders(query: str) -> str:
+    """Rewrite '?' placeholders as PostgreSQL's positional $1, $2, ..."""
+    parts = query.split("?")
+    return parts[0] + "".join(f"${i}{part}" for i, part in enumerate(parts[1:], start=1))
+
+
+# PREPARE bodies and matching EXECUTE calls for PostgreSQL
+_PG_PREPARE = {
+    name: f"PREPARE pos_{name} AS {numbered_placeholders(query)}"
+    for name, query in STATEMENTS.items()
+}
+_PG_EXECUTE = {
+    name: f"EXECUTE pos_{name} ({', '.join(['%s'] * query.count('?'))})"
+    for name, query in STATEMENTS.items()
+}
+
+
+class SqliteConnection(sqlite3.Connection):
+    """sqlite3 connection carrying the CLI's named statement cache."""
+
+    is_pg = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stmt_cache: Dict[str, str] = {}
+
+
+def prepare_statements(conn) -> None:
+    """Fill ``conn.stmt_cache`` with runnable SQL for every entry in STATEMENTS.
+
+    SQLite gets the statements unchanged and relies on the driver's own
+    compiled statement cache.  On PostgreSQL each statement is PREPAREd
+    once on the server and the cache holds the matching EXECUTE call.
+    """
+    if not conn.is_pg:
+        conn.stmt_cache.update(STATEMENTS)
+        return
+    cur = conn.cursor()
+    for name in STATEMENTS:
+        cur.execute(_PG_PREPARE[name])
+    conn.stmt_cache.update(_PG_EXECUTE)
+    conn.commit()
+
+
+def import_psycopg2() -> bool:
+    """Import psycopg2 on first use and return whether it is available."""
+    global psycopg2, HAS_PSYCOPG2, PgConnection
+    if HAS_PSYCOPG2 is None:
+        try:
+            import psycopg2  # type: ignore
+            import psycopg2.extras  # type: ignore
+            import psycopg2.pool  # type: ignore
+        except ImportError:
+            # psycopg2 may not be installed; use SQLite as fallback
+            HAS_PSYCOPG2 = False
+            return False
 
-def adapt_sql(query: str, conn, params_present: bool = True) -> str:
-    """Return a SQL statement with correct parameter placeholders.
+        class _PgConnection(psycopg2.extensions.connection):  # type: ignore
+            """psycopg2 connection carrying the CLI's named statement cache."""
 
-    SQLite uses '?' for parameters, whereas psycopg2 (PostgreSQL) uses '%s'.
-    This helper replaces '?' with '%s' when using a psycopg2 connection.
-    """
-    is_pg = HAS_PSYCOPG2 and isinstance(conn, psycopg2.extensions.connection)  # type: ignore
-    if params_present and is_pg:
-        return query.replace("?", "%s")
-    return query
+            is_pg = True
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.stmt_cache: Dict[str, str] = {}
+
+        PgConnection = _PgConnection
+        HAS_PSYCOPG2 = True
+    return HAS_PSYCOPG2
+
+
+def use_postgres() -> bool:
+    """Return True when PostgreSQL credentials are set and psycopg2 is installed."""
+    return bool(
+        os.environ.get("DB_HOST")
+        and os.environ.get("DB_NAME")
+        and os.environ.get("DB_USER")
+        and os.environ.get("DB_PASSWORD")
+        and import_psycopg2()
+    )
 
 
 def get_connection(db_path: str = DB_FILENAME):
@@ -77,37 +183,94 @@ def get_connection(db_path: str = DB_FILENAME):
     using ``psycopg2``.  Otherwise it falls back to SQLite.  After opening
     the connection, ``create_tables()`` is called to ensure required tables
     exist.
+
+    PostgreSQL connections come from a shared pool; hand them back with
+    ``release_connection()`` rather than closing them.
     """
-    use_pg = (
-        HAS_PSYCOPG2
-        and os.environ.get("DB_HOST")
-        and os.environ.get("DB_NAME")
-        and os.environ.get("DB_USER")
-        and os.environ.get("DB_PASSWORD")
-    )
-    if use_pg:
-        conn = psycopg2.connect(
-            host=os.environ["DB_HOST"],
-            port=os.environ.get("DB_PORT", "5432"),
-            dbname=os.environ["DB_NAME"],
-            user=os.environ["DB_USER"],
-            password=os.environ["DB_PASSWORD"],
-        )
-        conn.cursor_factory = psycopg2.extras.DictCursor  # type: ignore
-        create_tables(conn)
+    global _PG_POOL
+    if use_postgres():
+        if _PG_POOL is None:
+            _PG_POOL = psycopg2.pool.ThreadedConnectionPool(  # type: ignore
+                1,
+                20,
+                host=os.environ["DB_HOST"],
+                port=os.environ.get("DB_PORT", "5432"),
+                dbname=os.environ["DB_NAME"],
+                user=os.environ["DB_USER"],
+                password=os.environ["DB_PASSWORD"],
+                connection_factory=PgConnection,
+            )
+        conn = _PG_POOL.getconn()
+        if not conn.stmt_cache:
+            # First checkout of this pooled connection
+            conn.cursor_factory = psycopg2.extras.DictCursor  # type: ignore
+            create_tables(conn)
+            prepare_statements(conn)
         return conn
     else:
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=SqliteConnection)
         conn.row_factory = sqlite3.Row
+        # page_size only takes effect on a new database and must be set
+        # before switching to WAL
+        conn.execute("PRAGMA page_size=4096")
+        # WAL with synchronous=NORMAL avoids an fsync per commit
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Keep hot pages in memory: 64 MB page cache, 256 MB memory map
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
         create_tables(conn)
+        prepare_statements(conn)
         return conn
 
 
+def release_connection(conn) -> None:
+    """Return a connection from ``get_connection()``.
+
+    Pooled PostgreSQL connections go back to the pool; SQLite connections
+    are closed.
+    """
+    if conn.is_pg and _PG_POOL is not None:
+        _PG_POOL.putconn(conn)
+    else:
+        conn.close()
+
+
+def migrate_sqlite_timestamps(conn: sqlite3.Connection) -> None:
+    """Convert a TEXT ``sales.timestamp`` column to INTEGER epoch seconds.
+
+    Older databases stored local ISO-8601 strings.  SQLite cannot change a
+    column's type in place, so the values are copied into a new INTEGER
+    column that replaces the old one; any other columns (such as those the
+    web front end adds) are left alone.  DROP COLUMN needs SQLite 3.35+,
+    which the RETURNING statements already require.
+    """
+    cur = conn.cursor()
+    columns = {row[1]: row[2] for row in cur.execute("PRAGMA table_info(sales)")}
+    if columns["timestamp"].upper() != "TEXT":
+        return
+    # sqlite3 does not open transactions for DDL; make the migration atomic
+    cur.execute("BEGIN")
+    # Indexes on the old column would block DROP COLUMN; they are recreated later
+    cur.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'sales' "
+        "AND sql LIKE '%timestamp%'"
+    )
+    for row in cur.fetchall():
+        cur.execute(f"DROP INDEX {row[0]}")
+    # ADD COLUMN only accepts a constant default; every insert sets the value
+    cur.execute("ALTER TABLE sales ADD COLUMN epoch INTEGER NOT NULL DEFAULT 0")
+    cur.execute("UPDATE sales SET epoch = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)")
+    cur.execute("ALTER TABLE sales DROP COLUMN timestamp")
+    cur.execute("ALTER TABLE sales RENAME COLUMN epoch TO timestamp")
+    conn.commit()
+
+
 def create_tables(conn) -> None:
     """Create required tables for inventory and sales for SQLite or PostgreSQL."""
-    is_pg = HAS_PSYCOPG2 and isinstance(conn, psycopg2.extensions.connection)  # type: ignore
     cur = conn.cursor()
-    if is_pg:
+    if conn.is_pg:
         # PostgreSQL table definitions
         cur.execute(
             """
@@ -125,12 +288,22 @@ def create_tables(conn) -> None:
                 id SERIAL PRIMARY KEY,
                 item_id INTEGER NOT NULL REFERENCES inventory(id),
                 quantity INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
+                timestamp BIGINT NOT NULL,
                 total_price REAL NOT NULL
             )
             """
         )
-        conn.commit()
+        # Older databases stored local ISO-8601 text; convert it to epoch seconds
+        cur.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'sales' AND column_name = 'timestamp'"
+        )
+        if cur.fetchone()[0] == "text":
+            cur.execute(
+                "ALTER TABLE sales ALTER COLUMN timestamp DROP DEFAULT, "
+                "ALTER COLUMN timestamp TYPE BIGINT "
+                "USING extract(epoch FROM timestamp::timestamptz)::bigint"
+            )
     else:
         # SQLite definitions
         cur.execute(
@@ -149,24 +322,98 @@ def create_tables(conn) -> None:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 item_id INTEGER NOT NULL,
                 quantity INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
                 total_price REAL NOT NULL,
                 FOREIGN KEY(item_id) REFERENCES inventory(id)
             )
             """
         )
-        conn.commit()
+        migrate_sqlite_timestamps(conn)
+    # Indexes for the sales history join/sort and name lookups
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_item_id ON sales(item_id)")
+    # Same definition as the web front end's index on the shared database;
+    # SQLite scans it in either direction
+    cur.execute("DROP INDEX IF EXISTS idx_sales_timestamp")
+    cur.execute("DROP INDEX IF EXISTS idx_sales_ts")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_ts_id ON sales(timestamp DESC, id DESC)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory(name)")
+    conn.commit()
 
 
 def add_item(conn: sqlite3.Connection, name: str, price: float, quantity: int) -> None:
-    """Add a new item to the inventory."""
+    """Add a new item to the inventory.
+
+    The change is not committed; the caller commits, typically once for
+    several writes (see ``main_menu``).
+    """
     cursor = conn.cursor()
-    query = "INSERT INTO inventory (name, price, quantity) VALUES (?, ?, ?)"
-    cursor.execute(adapt_sql(query, conn), (name.strip(), price, quantity))
-    conn.commit()
+    cursor.execute(conn.stmt_cache["insert_item"], (name.strip(), price, quantity))
     print(f"Item '{name}' added with price ${price:.2f} and quantity {quantity}.")
 
 
+@functools.lru_cache(maxsize=None)
+def _bulk_insert_sql(n_rows: int) -> str:
+    """Return an INSERT into inventory with ``n_rows`` rows of placeholders.
+
+    At most _BULK_CHUNK_ROWS distinct sizes are ever requested.
+    """
+    return "INSERT INTO inventory (name, price, quantity) VALUES " + ", ".join(
+        ["(?, ?, ?)"] * n_rows
+    )
+
+
+def add_items_bulk(conn, items: List[Tuple[str, float, int]]) -> None:
+    """Add many ``(name, price, quantity)`` items as one unit.
+
+    Either every item is inserted or, if an INSERT fails, none are.  The
+    change is not committed; the caller commits.
+    """
+    rows = [(name.strip(), price, quantity) for name, price, quantity in items]
+    if not rows:
+        return
+    cursor = conn.cursor()
+    if not conn.is_pg and not conn.in_transaction:
+        # Otherwise the savepoint would start the transaction and RELEASE
+        # would commit it; psycopg2 always has one open here
+        cursor.execute("BEGIN")
+    # A savepoint lets a failed batch roll back without discarding other
+    # uncommitted writes on the connection
+    cursor.execute("SAVEPOINT items_bulk")
+    try:
+        if conn.is_pg:
+            # execute_values folds the rows into one multi-row INSERT
+            psycopg2.extras.execute_values(  # type: ignore
+                cursor,
+                "INSERT INTO inventory (name, price, quantity) VALUES %s",
+                rows,
+                page_size=1000,
+            )
+        else:
+            # One multi-row INSERT per chunk of up to _BULK_CHUNK_ROWS rows,
+            # the last one sized to the remainder
+            for start in range(0, len(rows), _BULK_CHUNK_ROWS):
+                chunk = rows[start:start + _BULK_CHUNK_ROWS]
+                cursor.execute(_bulk_insert_sql(len(chunk)), list(chain.from_iterable(chunk)))
+    except Exception:
+        cursor.execute("ROLLBACK TO SAVEPOINT items_bulk")
+        cursor.execute("RELEASE SAVEPOINT items_bulk")
+        raise
+    cursor.execute("RELEASE SAVEPOINT items_bulk")
+    print(f"{len(rows)} items added.")
+
+
+def stream_cursor(conn, name: str):
+    """Return a cursor that yields rows as they are read.
+
+    On PostgreSQL this is a named server-side cursor, which fetches rows
+    from the server in batches instead of buffering the whole result.
+    sqlite3 cursors already step through results lazily.
+    """
+    if conn.is_pg:
+        return conn.cursor(name=name)
+    return conn.cursor()
+
+
 def list_inventory(conn: sqlite3.Connection) -> List[sqlite3.Row]:
     """Return a list of all items in the inventory."""
     cursor = conn.cursor()
@@ -175,124 +422,190 @@ def list_inventory(conn: sqlite3.Connection) -> List[sqlite3.Row]:
     return items
 
 
+def get_item(conn, item_id: int):
+    """Return the ``name, price, quantity`` row for an item, or None if it does not exist."""
+    cursor = conn.cursor()
+    cursor.execute(conn.stmt_cache["select_item"], (item_id,))
+    return cursor.fetchone()
+
+
+def write_lines(lines: Iterator[str], batch: int = 1000) -> None:
+    """Write lines to stdout, joining up to ``batch`` of them per write call.
+
+    This avoids a print() call and write per row while keeping memory
+    bounded for long listings.
+    """
+    for chunk in iter(lambda: list(islice(lines, batch)), []):
+        sys.stdout.write("\n".join(chunk) + "\n")
+
+
 def view_inventory(conn: sqlite3.Connection) -> None:
     """Display the inventory to the user."""
-    items = list_inventory(conn)
-    if not items:
+    cursor = stream_cursor(conn, "inventory_stream")
+    cursor.execute("SELECT id, name, price, quantity FROM inventory ORDER BY id")
+    item = cursor.fetchone()
+    if item is None:
+        cursor.close()
         print("\nInventory is empty. Use option 1 to add items.\n")
         return
-    print("\nCurrent Inventory:\n")
-    print(f"{'ID':<5}{'Name':<20}{'Price':<10}{'Quantity':<10}")
-    print("-" * 45)
-    for item in items:
-        print(f"{item['id']:<5}{item['name']:<20}${item['price']:<9.2f}{item['quantity']:<10}")
-    print()
+    header = [
+        "",
+        "Current Inventory:",
+        "",
+        f"{'ID':<5}{'Name':<20}{'Price':<10}{'Quantity':<10}",
+        "-" * 45,
+    ]
+    lines = (
+        f"{item['id']:<5}{item['name']:<20}${item['price']:<9.2f}{item['quantity']:<10}"
+        for item in chain((item,), cursor)
+    )
+    write_lines(chain(header, lines, [""]))
+    cursor.close()
 
 
 def record_sale(conn: sqlite3.Connection, item_id: int, quantity: int) -> None:
     """Record a sale of an item and update inventory.
 
+    The change is not committed; the caller commits.
+
     Args:
         conn: Database connection.
         item_id: ID of the item to sell.
         quantity: Quantity sold.
     """
     cursor = conn.cursor()
-    # Check if item exists and has enough stock
-    cursor.execute(
-        adapt_sql("SELECT name, price, quantity FROM inventory WHERE id = ?", conn),
-        (item_id,),
-    )
-    row = cursor.fetchone()
+    row = None
+    if quantity > 0:
+        # Debit the stock only if enough is on hand, in the same statement
+        cursor.execute(conn.stmt_cache["sell_stock"], (quantity, item_id, quantity))
+        row = cursor.fetchone()
     if row is None:
-        print(f"No item found with ID {item_id}.")
-        return
-    if quantity <= 0:
-        print("Quantity must be positive.")
-        return
-    if row["quantity"] < quantity:
-        print(f"Insufficient stock. Available quantity: {row['quantity']}.")
+        # Nothing was sold; look the item up to report why
+        current = get_item(conn, item_id)
+        if current is None:
+            print(f"No item found with ID {item_id}.")
+        elif quantity <= 0:
+            print("Quantity must be positive.")
+        else:
+            print(f"Insufficient stock. Available quantity: {current['quantity']}.")
         return
-    # Calculate total
-    total_price = row["price"] * quantity
-    # Update inventory
-    cursor.execute(
-        adapt_sql("UPDATE inventory SET quantity = quantity - ? WHERE id = ?", conn),
-        (quantity, item_id),
-    )
-    # Insert sale record
-    timestamp = datetime.now().isoformat(timespec="seconds")
+    # Insert sale record; timestamps are stored as Unix epoch seconds
+    timestamp = int(time.time())
     cursor.execute(
-        adapt_sql(
-            "INSERT INTO sales (item_id, quantity, timestamp, total_price) VALUES (?, ?, ?, ?)",
-            conn,
-        ),
-        (item_id, quantity, timestamp, total_price),
+        conn.stmt_cache["insert_sale"], (quantity, timestamp, quantity, item_id)
     )
-    conn.commit()
+    total_price = cursor.fetchone()["total_price"]
     print(
-        f"Sold {quantity}x '{row['name']}' for ${total_price:.2f} at {timestamp}."
+        f"Sold {quantity}x '{row['name']}' for ${total_price:.2f} at {format_timestamp(timestamp)}."
+    )
+
+
+def record_sales_bulk(conn, lines: List[Tuple[int, int]]) -> bool:
+    """Record a basket of ``(item_id, quantity)`` sales.
+
+    The stock for every line is debited with one executemany() and the
+    sale rows are inserted with another.  If any line names an unknown item
+    or lacks stock, none of the basket is recorded.  Returns True when the
+    basket was recorded.
+
+    The change is not committed; the caller commits.
+    """
+    if not lines:
+        return True
+    if any(quantity <= 0 for _, quantity in lines):
+        print("Quantity must be positive.")
+        return False
+    timestamp = int(time.time())
+    cursor = conn.cursor()
+    if not conn.is_pg and not conn.in_transaction:
+        # Otherwise the savepoint would start the transaction and RELEASE
+        # would commit it; psycopg2 always has one open here
+        cursor.execute("BEGIN")
+    # A savepoint lets a failed basket roll back without discarding
+    # other uncommitted writes on the connection
+    cursor.execute("SAVEPOINT sales_bulk")
+    cursor.executemany(
+        conn.stmt_cache["sell_stock_batch"],
+        [(quantity, item_id, quantity) for item_id, quantity in lines],
     )
+    if cursor.rowcount != len(lines):
+        cursor.execute("ROLLBACK TO SAVEPOINT sales_bulk")
+        cursor.execute("RELEASE SAVEPOINT sales_bulk")
+        print("Sale aborted: an item was not found or has insufficient stock.")
+        return False
+    cursor.executemany(
+        conn.stmt_cache["insert_sale_batch"],
+        [(quantity, timestamp, quantity, item_id) for item_id, quantity in lines],
+    )
+    cursor.execute("RELEASE SAVEPOINT sales_bulk")
+    print(f"Recorded {len(lines)} sales at {format_timestamp(timestamp)}.")
+    return True
+
+
+def format_timestamp(timestamp: int) -> str:
+    """Format a stored epoch-seconds timestamp as local ISO-8601 for display."""
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
 
 
 def view_sales(conn: sqlite3.Connection) -> None:
     """Display sales records."""
-    cursor = conn.cursor()
+    cursor = stream_cursor(conn, "sales_stream")
     cursor.execute(
         """
         SELECT sales.id, inventory.name, sales.quantity, sales.total_price, sales.timestamp
         FROM sales
         JOIN inventory ON sales.item_id = inventory.id
-        ORDER BY sales.timestamp
+        ORDER BY sales.timestamp, sales.id
         """
     )
-    rows = cursor.fetchall()
-    if not rows:
+    row = cursor.fetchone()
+    if row is None:
+        cursor.close()
         print("\nNo sales have been recorded yet.\n")
         return
-    print("\nSales History:\n")
-    print(f"{'Sale ID':<8}{'Item':<20}{'Qty':<6}{'Total':<12}{'Timestamp':<20}")
-    print("-" * 68)
-    for row in rows:
-        print(
-            f"{row['id']:<8}{row['name']:<20}{row['quantity']:<6}${row['total_price']:<11.2f}{row['timestamp']:<20}"
-        )
-    print()
+    header = [
+        "",
+        "Sales History:",
+        "",
+        f"{'Sale ID':<8}{'Item':<20}{'Qty':<6}{'Total':<12}{'Timestamp':<20}",
+        "-" * 68,
+    ]
+    # Format rows as they arrive rather than materialising the history
+    lines = (
+        f"{row['id']:<8}{row['name']:<20}{row['quantity']:<6}${row['total_price']:<11.2f}{format_timestamp(row['timestamp']):<20}"
+        for row in chain((row,), cursor)
+    )
+    write_lines(chain(header, lines, [""]))
+    cursor.close()
 
 
 def update_item(conn: sqlite3.Connection, item_id: int, name: Optional[str], price: Optional[float], quantity: Optional[int]) -> None:
-    """Update fields of an existing item. Only supplied values are changed."""
+    """Update fields of an existing item. Only supplied values are changed.
+
+    The change is not committed; the caller commits.
+    """
+    # Unchanged fields are passed as None and kept by the database, so
+    # concurrent changes to them are never overwritten
+    new_name = name.strip() if name and name.strip() else None
     cursor = conn.cursor()
-    cursor.execute(adapt_sql("SELECT name, price, quantity FROM inventory WHERE id = ?", conn), (item_id,))
-    row = cursor.fetchone()
-    if row is None:
+    cursor.execute(conn.stmt_cache["update_item"], (new_name, price, quantity, item_id))
+    if cursor.fetchone() is None:
         print(f"No item found with ID {item_id}.")
         return
-    # Determine new values
-    new_name = name.strip() if name else row["name"]
-    new_price = price if price is not None else row["price"]
-    new_quantity = quantity if quantity is not None else row["quantity"]
-    cursor.execute(
-        adapt_sql(
-            "UPDATE inventory SET name = ?, price = ?, quantity = ? WHERE id = ?",
-            conn,
-        ),
-        (new_name, new_price, new_quantity, item_id),
-    )
-    conn.commit()
     print(f"Item {item_id} updated.")
 
 
 def delete_item(conn: sqlite3.Connection, item_id: int) -> None:
-    """Remove an item from the inventory. Associated sales remain in the history."""
+    """Remove an item from the inventory. Associated sales remain in the history.
+
+    The change is not committed; the caller commits.
+    """
     cursor = conn.cursor()
-    cursor.execute(adapt_sql("SELECT name FROM inventory WHERE id = ?", conn), (item_id,))
+    cursor.execute(conn.stmt_cache["delete_item"], (item_id,))
     row = cursor.fetchone()
     if row is None:
         print(f"No item found with ID {item_id}.")
         return
-    cursor.execute(adapt_sql("DELETE FROM inventory WHERE id = ?", conn), (item_id,))
-    conn.commit()
     print(f"Item '{row['name']}' deleted from inventory.")
 
 
@@ -316,10 +629,7 @@ def prompt_for_int(prompt: str) -> int:
             print("Please enter a valid integer.")
 
 
-def main_menu(conn: sqlite3.Connection) -> None:
-    """Display the main menu and dispatch user selections."""
-    while True:
-        print("""
+_MENU_TEXT = """
 ==== Local POS System ====
 1. Add new item
 2. View inventory
@@ -328,7 +638,19 @@ def main_menu(conn: sqlite3.Connection) -> None:
 5. Record a sale
 6. View sales history
 7. Exit
-""")
+"""
+
+
+def main_menu(conn: sqlite3.Connection) -> None:
+    """Display the main menu and dispatch user selections.
+
+    Each write action is committed as soon as it finishes, so no write
+    transaction is held open while waiting for input (the web front end
+    writes to the same database).  WAL with synchronous=NORMAL keeps these
+    commits cheap.
+    """
+    while True:
+        print(_MENU_TEXT)
         choice = input("Select an option (1-7): ").strip()
         if choice == "1":
             name = input("Enter item name: ").strip()
@@ -338,6 +660,7 @@ def main_menu(conn: sqlite3.Connection) -> None:
             price = prompt_for_float("Enter item price: ")
             quantity = prompt_for_int("Enter starting quantity: ")
             add_item(conn, name, price, quantity)
+            conn.commit()
         elif choice == "2":
             view_inventory(conn)
         elif choice == "3":
@@ -361,14 +684,17 @@ def main_menu(conn: sqlite3.Connection) -> None:
                     print("Invalid quantity entered. Update aborted.")
                     continue
             update_item(conn, item_id, new_name if new_name.strip() else None, new_price, new_quantity)
+            conn.commit()
         elif choice == "4":
             item_id = prompt_for_int("Enter the ID of the item to delete: ")
             delete_item(conn, item_id)
+            conn.commit()
         elif choice == "5":
             view_inventory(conn)
             item_id = prompt_for_int("Enter the ID of the item to sell: ")
             quantity = prompt_for_int("Enter quantity sold: ")
             record_sale(conn, item_id, quantity)
+            conn.commit()
         elif choice == "6":
             view_sales(conn)
         elif choice == "7":
@@ -384,4 +710,4 @@ if __name__ == "__main__":
     try:
         main_menu(conn)
     finally:
-        conn.close()
\ No newline at end of file
+        release_connection(conn)
\ No newline at end of file